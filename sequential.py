@@ -1,9 +1,28 @@
+import math
+from dataclasses import dataclass
+from functools import lru_cache
 import numpy as np
-from scipy.stats import norm
+from src.power import z_upper
+
+try:
+    from numba import njit, prange
+except ImportError:  # run the kernels as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda f: f
+
+@lru_cache(maxsize=32)
+def _pocock_arr(alpha, looks):
+    c = z_upper(float(alpha / (2 * np.log(1 + looks))))
+    arr = np.full(looks, c)
+    arr.flags.writeable = False  # shared across callers via the cache
+    return arr
 
 def pocock_boundaries(alpha=0.05, looks=5):
-    c = norm.ppf(1 - alpha / (2 * np.log(1 + looks)))
-    return [c] * looks
+    return _pocock_arr(alpha, looks).tolist()
 
 def z_stat_proportions(success_a, total_a, success_b, total_b):
     p_a = success_a / total_a
@@ -12,16 +31,52 @@ def z_stat_proportions(success_a, total_a, success_b, total_b):
     se = np.sqrt(p_pool * (1 - p_pool) * (1/total_a + 1/total_b))
     return (p_b - p_a) / se
 
-def sequential_monitor(stream_a, stream_b, looks=5, alpha=0.05):
-    boundaries = pocock_boundaries(alpha, looks)
-    decisions = []
-    for i in range(1, looks+1):
-        sa, ta = stream_a[i-1]
-        sb, tb = stream_b[i-1]
-        z = abs(z_stat_proportions(sa, ta, sb, tb))
-        stop = z > boundaries[i-1]
-        decisions.append({"look": i, "z": z, "boundary": boundaries[i-1], "stop": stop})
-        if stop: 
-            break
-    return decisions
+@dataclass
+class SequentialResult:
+    z: np.ndarray  # |z| at each evaluated look (up to and including the stop)
+    boundary: np.ndarray
+    stopped_at: int  # 0-based look index of the first crossing, -1 if none
+
+def sequential_monitor(stream_a, stream_b, looks=5, alpha=0.05) -> SequentialResult:
+    # stream_a / stream_b: array-like of shape (looks, 2) with cumulative (successes, totals)
+    boundaries = _pocock_arr(alpha, looks)
+    a = np.asarray(stream_a, dtype=float)[:looks]
+    b = np.asarray(stream_b, dtype=float)[:looks]
+    z = np.abs(z_stat_proportions(a[:, 0], a[:, 1], b[:, 0], b[:, 1]))
+    # Keep looks up to and including the first boundary crossing
+    crossed = np.flatnonzero(z > boundaries)
+    stop_at = int(crossed[0]) if crossed.size else -1
+    return SequentialResult(
+        z=z[:stop_at + 1] if stop_at >= 0 else z,
+        boundary=boundaries,
+        stopped_at=stop_at,
+    )
+
+@njit(cache=True, error_model="numpy")
+def _sequential_monitor_nb(sa, ta, sb, tb, boundaries):
+    # Scalar loop with early exit; returns (first stop index or -1, z values up to the stop)
+    looks = boundaries.shape[0]
+    z_buf = np.empty(looks)
+    for i in range(looks):
+        p_pool = (sa[i] + sb[i]) / (ta[i] + tb[i])
+        se = math.sqrt(p_pool * (1 - p_pool) * (1.0 / ta[i] + 1.0 / tb[i]))
+        z_buf[i] = abs((sb[i] / tb[i] - sa[i] / ta[i]) / se)
+        if z_buf[i] > boundaries[i]:
+            return i, z_buf[:i + 1]
+    return -1, z_buf
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def _sequential_stops_nb(sa, ta, sb, tb, boundaries):
+    n_sims = sa.shape[0]
+    stops = np.empty(n_sims, dtype=np.int64)
+    for k in prange(n_sims):
+        stops[k] = _sequential_monitor_nb(sa[k], ta[k], sb[k], tb[k], boundaries)[0]
+    return stops
 
+def sequential_stops(stream_a, stream_b, looks=5, alpha=0.05):
+    # Monte Carlo helper: streams of shape (n_sims, looks, 2) -> first stopping look index
+    # per trajectory (0-based, -1 if no boundary was crossed)
+    a = np.asarray(stream_a, dtype=np.float64)[:, :looks]
+    b = np.asarray(stream_b, dtype=np.float64)[:, :looks]
+    boundaries = np.array(_pocock_arr(alpha, looks))
+    return _sequential_stops_nb(a[..., 0], a[..., 1], b[..., 0], b[..., 1], boundaries)
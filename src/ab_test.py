@@ -1,8 +1,28 @@
 from dataclasses import dataclass
-from typing import Optional, Sequence, Tuple
+from typing import Optional, Sequence, Tuple, Union
 import numpy as np
-from scipy import stats
-from .cuped import cuped_adjust
+# Private SciPy module (moves between releases); see the scipy pin in env/requirements.txt
+from scipy._lib._array_api import array_namespace
+from scipy.special import ndtr, stdtr
+from .cuped import cuped_moments
+from .power import z_upper
+
+def welch_ttest(mean_1: float, var_1: float, n_1: int,
+                mean_2: float, var_2: float, n_2: int) -> Tuple[float, float]:
+    # Welch's t-test of mean_1 - mean_2 from sample moments (Welch-Satterthwaite df)
+    s_1 = var_1 / n_1
+    s_2 = var_2 / n_2
+    diff = mean_1 - mean_2
+    se = np.sqrt(s_1 + s_2)
+    if se > 0:
+        t_stat = diff / se
+        df = (s_1 + s_2) ** 2 / (s_1 ** 2 / (n_1 - 1) + s_2 ** 2 / (n_2 - 1))
+        return t_stat, 2.0 * stdtr(df, -abs(t_stat))
+    # Both groups constant: t is +/-inf (p = 0), unless the means only differ by
+    # rounding noise, in which case the test is undefined
+    if np.isclose(mean_1, mean_2):
+        return np.nan, np.nan
+    return np.copysign(np.inf, diff), 0.0
 
 @dataclass 
 class ABResult:
@@ -14,37 +34,50 @@ class ABResult:
     n_a: int
     n_b: int
 
-def ab_proportions( success_a: int,
-                    total_a: int,
-                    success_b: int,
-                    total_b: int,
+def ab_proportions( success_a: Union[int, Sequence[int]],
+                    total_a: Union[int, Sequence[int]],
+                    success_b: Union[int, Sequence[int]],
+                    total_b: Union[int, Sequence[int]],
                     alpha: float = 0.05,
                     continuity_correction: bool = False,
                     ) -> ABResult:
-    if total_a <= 0 or total_b <= 0:
+    # Counts may be scalars or equal-length arrays (one test per element);
+    # array inputs yield an ABResult whose fields are arrays.
+    sa = np.asarray(success_a)
+    ta = np.asarray(total_a)
+    sb = np.asarray(success_b)
+    tb = np.asarray(total_b)
+    if not all(np.all(np.isfinite(x)) for x in (sa, ta, sb, tb)):
+        raise ValueError("counts must be finite.")
+    if np.any(ta <= 0) or np.any(tb <= 0):
         raise ValueError("total_a and total_b must be positive.")
-    if not (0 <= success_a <= total_a and 0 <= success_b <= total_b):
+    if np.any(sa < 0) or np.any(sa > ta) or np.any(sb < 0) or np.any(sb > tb):
         raise ValueError("success counts must be between 0 and total.")
     
-    p_a = success_a / total_a
-    p_b = success_b / total_b
+    p_a = sa / ta
+    p_b = sb / tb
     diff = p_b - p_a
 
     # Pooled standard error
-    p_pool = (success_a + success_b) / (total_a + total_b)
-    se = np.sqrt(p_pool * (1 - p_pool) * (1 / total_a + 1 / total_b))
+    p_pool = (sa + sb) / (ta + tb)
+    se = np.sqrt(p_pool * (1 - p_pool) * (1 / ta + 1 / tb))
 
-    # Continuity correction (optional)
-    cc = (1 / total_a + 1 / total_b) if continuity_correction else 0.0
-    adj_diff = diff - np.sign(diff) * cc if continuity_correction and diff != 0 else diff
+    # Continuity correction (optional); sign(0) == 0 leaves zero diffs untouched
+    cc = (1 / ta + 1 / tb) if continuity_correction else 0.0
+    adj_diff = diff - np.sign(diff) * cc
 
-    z = stats.norm.ppf(1 - alpha / 2)
+    z = z_upper(alpha / 2)
     ci_low = diff - z * se
     ci_high = diff + z * se
 
     # Two-sided z-test using pooled SE
-    z_stat = adj_diff / se if se > 0 else 0.0
-    p_val = 2 * (1 - stats.norm.cdf(abs(z_stat))) if se > 0 else 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_stat = np.where(se > 0, adj_diff / se, 0.0)
+    p_val = np.where(se > 0, 2.0 * ndtr(-np.abs(z_stat)), 1.0)
+    n_a, n_b = ta, tb
+    if np.ndim(p_val) == 0:
+        p_val = float(p_val)
+        n_a, n_b = int(ta), int(tb)
 
     return ABResult(
         metric="proportion",
@@ -52,8 +85,8 @@ def ab_proportions( success_a: int,
         ci_low=ci_low,
         ci_high=ci_high,
         p_value=p_val,
-        n_a=total_a,
-        n_b=total_b,
+        n_a=n_a,
+        n_b=n_b,
     )
 
 
@@ -63,23 +96,28 @@ def ab_means(y_a: Sequence[float],
             cuped_theta_a: Optional[Sequence[float]] = None,
             cuped_theta_b: Optional[Sequence[float]] = None,
             ) -> ABResult:
-    ya = np.asarray(y_a, dtype=float)
-    yb = np.asarray(y_b, dtype=float)
-    if ya.size < 2 or yb.size < 2:
+    # Reductions stay in the input's array namespace (NumPy, CuPy, PyTorch, ...);
+    # only the resulting scalars go through SciPy.
+    xp = array_namespace(y_a, y_b)
+    ya = xp.asarray(y_a, dtype=xp.float64)
+    yb = xp.asarray(y_b, dtype=xp.float64)
+    if ya.shape[0] < 2 or yb.shape[0] < 2:
         raise ValueError("Both groups must have at least 2 observations.")
-    # Optional CUPED adjustment
+    # Optional CUPED adjustment (only the adjusted moments are needed)
     if cuped_theta_a is not None and cuped_theta_b is not None:
-        ya, _ = cuped_adjust(ya, np.asarray(cuped_theta_a, dtype=float))
-        yb, _ = cuped_adjust(yb, np.asarray(cuped_theta_b, dtype=float))
-
-    diff = yb.mean() - ya.mean()
-    se = np.sqrt(ya.var(ddof=1) / len(ya) + yb.var(ddof=1) / len(yb))
+        (ma, va, na), (mb, vb, nb) = cuped_moments(ya, cuped_theta_a, yb, cuped_theta_b)
+    else:
+        na, nb = ya.shape[0], yb.shape[0]
+        ma, mb = float(xp.mean(ya)), float(xp.mean(yb))
+        va, vb = float(xp.var(ya, correction=1)), float(xp.var(yb, correction=1))
+    diff = mb - ma
+    se = np.sqrt(va / na + vb / nb)
 
-    # Welch's t-test p-value
-    t_stat, p_val = stats.ttest_ind(yb, ya, equal_var=False)
+    # Welch's t-test p-value from the moments above
+    _, p_val = welch_ttest(mb, vb, nb, ma, va, na)
 
     # For CI, use normal approx for simplicity; for rigor, compute Welch CI with df
-    z = stats.norm.ppf(1 - alpha / 2)
+    z = z_upper(alpha / 2)
     ci_low = diff - z * se
     ci_high = diff + z * se
 
@@ -89,8 +127,8 @@ def ab_means(y_a: Sequence[float],
         ci_low=ci_low,
         ci_high=ci_high,
         p_value=float(p_val),
-        n_a=len(ya),
-        n_b=len(yb),
+        n_a=na,
+        n_b=nb,
     )
 
     
@@ -1,10 +1,64 @@
 import numpy as np
+# Private SciPy module (moves between releases); see the scipy pin in env/requirements.txt
+from scipy._lib._array_api import array_namespace
 
-def cuped_adjust(y, theta):
-    cov = np.cov(y, theta, ddof=1)
-    var = np.var(theta, ddof=1)
+def cuped_adjust(y, theta, theta_mean=None):
+    # y - c * (theta - theta_mean); pass the pooled theta mean when adjusting arms
+    # separately so adjusted outcomes stay comparable (defaults to this sample's mean)
+    y = np.asarray(y, dtype=float)
+    t = np.asarray(theta, dtype=float)
+    n = y.size
+    # Center once and reuse for both reductions (BLAS dot products)
+    dy = y - y.mean()
+    dt = t - t.mean()
+    var = np.dot(dt, dt) / (n - 1)
     if var == 0:
         return y, 0.0
-    c = cov / var  # compute constant c
-    y_adj = y - c * theta 
-    return y_adj, c
\ No newline at end of file
+    c = np.dot(dy, dt) / ((n - 1) * var)  # compute constant c = cov(y, theta) / var(theta)
+    y_adj = y - c * (dt if theta_mean is None else t - theta_mean)
+    return y_adj, c
+
+def cuped_adjust_multi(y, X, X_mean=None):
+    # Multi-covariate CUPED: X is (n, k); theta solves the centered least-squares
+    # problem, which for k == 1 reduces to cuped_adjust's c = cov(y, theta) / var(theta).
+    # Like cuped_adjust, X is centered on its own mean unless a (pooled) X_mean is given.
+    y = np.asarray(y, dtype=float)
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, None]
+    Xc = X - X.mean(axis=0)
+    yc = y - y.mean()
+    theta, *_ = np.linalg.lstsq(Xc, yc, rcond=None)
+    y_adj = y - (Xc if X_mean is None else X - X_mean) @ theta
+    return y_adj, theta
+
+def cuped_moments(y_a, theta_a, y_b, theta_b):
+    # Adjusted (mean, variance, n) for both groups without materializing y - c*theta.
+    # One c is estimated from both groups together (pooled within-group covariance)
+    # and applied around the pooled theta mean, so the adjustment cancels in the
+    # difference of means instead of adding per-group noise scaled by theta's level.
+    # Array-API generic, so CuPy/PyTorch inputs are reduced on their own device.
+    xp = array_namespace(y_a, theta_a, y_b, theta_b)
+    groups = []
+    for y, theta in ((y_a, theta_a), (y_b, theta_b)):
+        y = xp.asarray(y, dtype=xp.float64)
+        t = xp.asarray(theta, dtype=xp.float64)
+        ym = float(xp.mean(y))
+        tm = float(xp.mean(t))
+        groups.append((y.shape[0], ym, tm, y - ym, t - tm))
+    s_tt = sum(float(xp.vecdot(dt, dt)) for _, _, _, _, dt in groups)
+    s_yt = sum(float(xp.vecdot(dy, dt)) for _, _, _, dy, dt in groups)
+    c = s_yt / s_tt if s_tt > 0 else 0.0
+    n_a, n_b = groups[0][0], groups[1][0]
+    t_pooled = (n_a * groups[0][2] + n_b * groups[1][2]) / (n_a + n_b)
+    moments = []
+    for n, ym, tm, dy, dt in groups:
+        # Residual variance from the residuals themselves, so it can't go negative;
+        # a residual sd at rounding level of y's scale (theta collinear with y) is 0
+        r = dy - c * dt
+        var_r = float(xp.vecdot(r, r)) / (n - 1)
+        sd_y = (float(xp.vecdot(dy, dy)) / (n - 1)) ** 0.5
+        if var_r ** 0.5 <= 1e-12 * (abs(ym) + sd_y):
+            var_r = 0.0
+        moments.append((ym - c * (tm - t_pooled), var_r, n))
+    return moments[0], moments[1]
@@ -1,10 +1,15 @@
 import os
 import math
-import random
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pac
+except ImportError:  # fall back to pandas' writer
+    pa = None
+
 # ---------------------
 # Tunable parameters
 # ---------------------
@@ -37,43 +42,70 @@ TT_SUB_TREAT_MEAN   = 7.0
 TT_SUB_SHAPE = 2.0  # gamma shape
 
 # Randomization options
-PLATFORMS = ["web", "ios", "android"]
-CHANNELS = ["paid", "organic", "referral", "partner"]
+VARIANTS = np.array(["control", "treatment"])  # code 1 == treatment
+PLATFORMS = np.array(["web", "ios", "android"])
+CHANNELS = np.array(["paid", "organic", "referral", "partner"])
 
-rng = np.random.default_rng(42)
-random.seed(42)
+SEED = 42
 
-def gamma_days(mean_days, shape, size):
+def gamma_days(rng, mean_days, shape, size):
     scale = mean_days / shape
     return rng.gamma(shape, scale, size=size)
 
-def bounded_date(i):
-    # Spread users uniformly over DAYS for assigned_at/event_date
-    day_offset = rng.integers(0, DAYS)
-    return START_DATE + timedelta(days=int(day_offset))
-
-def main():
+def days_to_timedelta(days):
+    # Fractional days -> second-resolution timedelta64 array
+    return (days * 86400).astype("timedelta64[s]")
+
+def iso_or_blank(ts):
+    # ISO strings for datetime64 values, empty string for NaT
+    return np.where(np.isnat(ts), "", np.datetime_as_string(ts, unit="s"))
+
+def write_csv(df, path):
+    # Arrow's multi-threaded C++ writer is much faster than DataFrame.to_csv
+    if pa is None:
+        df.to_csv(path, index=False)
+    else:
+        # Match to_csv's layout: Arrow always quotes header names and quotes strings
+        # by default, so write a plain header and the body without quoting.
+        # quoting_style="none" raises if a string value ever contains a comma, quote
+        # or newline; seed values don't, but new columns must keep it that way.
+        # Arrow also prints whole floats without ".0" (14 vs 14.0), so float columns
+        # are pre-formatted the way to_csv does (repr, blank for NaN).
+        floats = df.select_dtypes("float").columns
+        df = df.assign(**{
+            col: np.where(df[col].isna(), "", df[col].to_numpy().astype(str)) for col in floats
+        })
+        with open(path, "wb") as f:
+            f.write((",".join(df.columns) + "\n").encode())
+            pac.write_csv(pa.Table.from_pandas(df, preserve_index=False), f,
+                          write_options=pac.WriteOptions(include_header=False, quoting_style="none"))
+
+def main(seed=SEED):
     os.makedirs("dbt_project/seeds", exist_ok=True)
+    rng = np.random.default_rng(seed)
 
     # Assign users and variants (50/50)
     user_ids = np.arange(1, N_USERS + 1, dtype=int)
-    variants = rng.choice(["control", "treatment"], size=N_USERS, replace=True)
-    platforms = rng.choice(PLATFORMS, size=N_USERS, replace=True)
-    channels = rng.choice(CHANNELS, size=N_USERS, replace=True)
-    assigned_dates = [bounded_date(i) for i in range(N_USERS)]
-    assigned_times = [datetime.combine(d, datetime.min.time()) + timedelta(
-        seconds=int(rng.integers(0, 24*3600))) for d in assigned_dates]
+    # Categorical columns are kept as small integer codes and decoded only for the CSV
+    variants = rng.integers(0, len(VARIANTS), size=N_USERS, dtype=np.int8)
+    platforms = rng.integers(0, len(PLATFORMS), size=N_USERS, dtype=np.int8)
+    channels = rng.integers(0, len(CHANNELS), size=N_USERS, dtype=np.int8)
+    # Spread users uniformly over DAYS for assigned_at/event_date
+    day_offsets = rng.integers(0, DAYS, size=N_USERS)
+    sec_offsets = rng.integers(0, 24*3600, size=N_USERS)
+    assigned_at = (np.datetime64(START_DATE, "D") + day_offsets.astype("timedelta64[D]")).astype(
+        "datetime64[s]") + sec_offsets.astype("timedelta64[s]")
 
     # Pre-engagement (sessions in prior 30d)
     pre_engagement = np.zeros(N_USERS, dtype=float)
-    mask_t = variants == "treatment"
+    mask_t = variants == 1
     mask_c = ~mask_t
     pre_engagement[mask_c] = rng.poisson(LAMBDA_PRE_C, size=mask_c.sum())
     pre_engagement[mask_t] = rng.poisson(LAMBDA_PRE_T, size=mask_t.sum())
 
     # Winsorize pre_engagement
     cutoff = np.quantile(pre_engagement, WINSOR_PCTL)
-    pre_engagement = np.clip(pre_engagement, 0, cutoff)
+    np.clip(pre_engagement, 0, cutoff, out=pre_engagement)
 
     # Trial start probabilities
     p_trial = np.where(mask_t, P_TRIAL_C * (1 + REL_LIFT_TRIAL), P_TRIAL_C)
@@ -90,61 +122,54 @@ def main():
     # Refund and early churn among payers
     p_refund = np.where(mask_t, P_REFUND_FIRST_CYCLE_C + DELTA_REFUND, P_REFUND_FIRST_CYCLE_C)
     p_churn = np.where(mask_t, P_EARLY_CHURN_30D_C + DELTA_CHURN, P_EARLY_CHURN_30D_C)
+    np.clip(p_refund, 0, 1, out=p_refund)
+    np.clip(p_churn, 0, 1, out=p_churn)
 
     refund_in_first_cycle = np.zeros(N_USERS, dtype=int)
     early_churn_30d = np.zeros(N_USERS, dtype=int)
 
     idx_paid = np.where(paid_subscriber == 1)[0]
-    refund_in_first_cycle[idx_paid] = rng.binomial(1, np.clip(p_refund[idx_paid], 0, 1))
-    early_churn_30d[idx_paid] = rng.binomial(1, np.clip(p_churn[idx_paid], 0, 1))
+    refund_in_first_cycle[idx_paid] = rng.binomial(1, p_refund[idx_paid])
+    early_churn_30d[idx_paid] = rng.binomial(1, p_churn[idx_paid])
 
-    # trial_start_at and paid_at timestamps
-    trial_start_at = [None] * N_USERS
-    paid_at = [None] * N_USERS
+    # trial_start_at and paid_at timestamps (NaT where the event never happened)
+    trial_start_at = np.full(N_USERS, np.datetime64("NaT"), dtype="datetime64[s]")
+    paid_at = np.full(N_USERS, np.datetime64("NaT"), dtype="datetime64[s]")
     time_to_subscribe_days = np.full(N_USERS, np.nan, dtype=float)
 
     # Time to trial start: beta skew in first few days after assignment
     tt_trial_days = rng.gamma(2.0, 2.0, size=idx_trial.size)  # mean ~4 days
-    for j, i in enumerate(idx_trial):
-        tdays = float(tt_trial_days[j])
-        trial_dt = assigned_times[i] + timedelta(days=tdays)
-        trial_start_at[i] = trial_dt
+    trial_start_at[idx_trial] = assigned_at[idx_trial] + days_to_timedelta(tt_trial_days)
 
     # Time to subscribe distribution (for paid users)
     # Control longer mean, Treatment shorter mean
-    tt_paid_days = np.zeros(idx_paid.size)
-    for j, i in enumerate(idx_paid):
-        if variants[i] == "treatment":
-            tt = gamma_days(TT_SUB_TREAT_MEAN, TT_SUB_SHAPE, 1)[0]
-        else:
-            tt = gamma_days(TT_SUB_CONTROL_MEAN, TT_SUB_SHAPE, 1)[0]
-        # Ensure paid_at after trial_start_at if trial exists, else after assignment
-        anchor = trial_start_at[i] if trial_start_at[i] is not None else assigned_times[i]
-        paid_dt = anchor + timedelta(days=float(tt))
-        paid_at[i] = paid_dt
-        time_to_subscribe_days[i] = (paid_dt - assigned_times[i]).days + ((paid_dt - assigned_times[i]).seconds / 86400.0)
+    tt_paid_days = np.where(mask_t[idx_paid],
+                            gamma_days(rng, TT_SUB_TREAT_MEAN, TT_SUB_SHAPE, idx_paid.size),
+                            gamma_days(rng, TT_SUB_CONTROL_MEAN, TT_SUB_SHAPE, idx_paid.size))
+    # Ensure paid_at after trial_start_at if trial exists, else after assignment
+    anchors = np.where(trial_start[idx_paid] == 1, trial_start_at[idx_paid], assigned_at[idx_paid])
+    paid_at[idx_paid] = anchors + days_to_timedelta(tt_paid_days)
+    time_to_subscribe_days[idx_paid] = (paid_at[idx_paid] - assigned_at[idx_paid]) / np.timedelta64(1, "D")
 
     # event_date anchor (use assignment date for daily grouping)
-    event_dates = [dt.date() for dt in assigned_times]
+    event_dates = np.datetime_as_string(assigned_at, unit="D")
 
     # Build DataFrames
     assignments = pd.DataFrame({
         "user_id": user_ids,
-        "variant": variants,
-        "assigned_at": assigned_times,
-        "platform": platforms,
-        "acquisition_channel": channels,
+        "variant": np.take(VARIANTS, variants),
+        "assigned_at": np.datetime_as_string(assigned_at, unit="s"),  # ISO formatting
+        "platform": np.take(PLATFORMS, platforms),
+        "acquisition_channel": np.take(CHANNELS, channels),
     })
-    # Ensure ISO formatting for timestamps
-    assignments["assigned_at"] = assignments["assigned_at"].map(lambda x: x.isoformat())
 
     outcomes = pd.DataFrame({
         "user_id": user_ids,
         "event_date": event_dates,  # date anchor for grouping/plots
         "trial_start": trial_start,
-        "trial_start_at": [ts.isoformat() if isinstance(ts, datetime) else "" for ts in trial_start_at],
+        "trial_start_at": iso_or_blank(trial_start_at),
         "paid_subscriber": paid_subscriber,
-        "paid_at": [ts.isoformat() if isinstance(ts, datetime) else "" for ts in paid_at],
+        "paid_at": iso_or_blank(paid_at),
         "refund_in_first_cycle": refund_in_first_cycle,
         "early_churn_30d": early_churn_30d,
         "time_to_subscribe_days": np.round(time_to_subscribe_days, 3),
@@ -154,8 +179,8 @@ def main():
     # Write CSVs
     a_path = "dbt_project/seeds/assignments_seed.csv"
     o_path = "dbt_project/seeds/outcomes_seed.csv"
-    assignments.to_csv(a_path, index=False)
-    outcomes.to_csv(o_path, index=False)
+    write_csv(assignments, a_path)
+    write_csv(outcomes, o_path)
 
     print(f"Wrote: {a_path} ({len(assignments):,} rows)")
     print(f"Wrote: {o_path} ({len(outcomes):,} rows)")
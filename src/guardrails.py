@@ -1,13 +1,22 @@
 import numpy as np
-from scipy.stats import chisquare, ttest_ind
+from scipy.special import chdtrc
+from .ab_test import welch_ttest
 
 def srm_check(n_a: int, n_b: int, expected_ratios=(0.5, 0.5)):
+    # 1-dof chi-square goodness of fit, evaluated directly on scalars
+    if len(expected_ratios) != 2:
+        raise ValueError("expected_ratios must have exactly 2 entries.")
+    if not np.isclose(sum(expected_ratios), 1.0):
+        raise ValueError("expected_ratios must sum to 1.")
     total = n_a + n_b
-    expected = np.array(expected_ratios) * total
-    observed = np.array([n_a, n_b])
-    stat, p = chisquare(f_obs=observed, f_exp=expected)
+    e_a = expected_ratios[0] * total
+    e_b = expected_ratios[1] * total
+    stat = (n_a - e_a) ** 2 / e_a + (n_b - e_b) ** 2 / e_b
+    p = chdtrc(1, stat)
     return {"chi2": stat, "p_value": p, "srm_flag": p < 0.01}
 
 def invariant_ttest(x_a, x_b, alpha=0.01):
-    stat, p = ttest_ind(x_a, x_b, equal_var=False)
-    return {"t": stat, "p_value": p, "violation": p < alpha}
\ No newline at end of file
+    xa = np.asarray(x_a, dtype=float)
+    xb = np.asarray(x_b, dtype=float)
+    stat, p = welch_ttest(xa.mean(), xa.var(ddof=1), xa.size, xb.mean(), xb.var(ddof=1), xb.size)
+    return {"t": stat, "p_value": p, "violation": p < alpha}
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Union
 import numpy as np
-from scipy.stats import norm
+from scipy.special import ndtri
 
 @dataclass
 class PowerParams:
@@ -10,24 +12,56 @@ class PowerParams:
     power: float = 0.8
     two_tailed: bool = True
 
-def sample_size_proportions(params: PowerParams) -> int:
-    p1 = params.baseline
-    p2 = params.baseline + params.mde
-    alpha = params.alpha
-    beta = 1 - params.power
-    z_alpha = norm.ppf(1 - alpha/2) if params.two_tailed else norm.ppf(1 - alpha)
-    z_beta = norm.ppf(1 - beta)
+@lru_cache(maxsize=64)
+def z_upper(tail: float) -> float:
+    # Upper-tail standard normal quantile, i.e. norm.ppf(1 - tail); cached since
+    # the same few alphas/powers are requested over and over
+    return float(ndtri(1 - tail))
+
+def _z_power(power) -> Union[float, np.ndarray]:
+    # norm.ppf(power); scalar powers go through the cache
+    if np.ndim(power) == 0:
+        return z_upper(1 - power)
+    return ndtri(power)
+
+def _ceil_sizes(num, den, mde) -> np.ndarray:
+    # Never cast inf/nan to int64 (it wraps to INT64_MIN)
+    if np.any(mde == 0):
+        raise ValueError("mde must be non-zero.")
+    n = np.ceil(num / den)
+    if not np.all(np.isfinite(n)):
+        raise ValueError("sample size is undefined for the given inputs.")
+    return n.astype(np.int64)
+
+def sample_size_proportions_grid(baseline, mde, alpha: float = 0.05, power=0.8,
+                                 two_tailed: bool = True) -> np.ndarray:
+    # Per-group sample sizes over broadcast baseline x mde x power grids
+    baseline, mde, power = np.broadcast_arrays(
+        np.asarray(baseline, dtype=float), np.asarray(mde, dtype=float), np.asarray(power, dtype=float))
+    p1 = baseline
+    p2 = baseline + mde
+    z_alpha = z_upper(alpha/2) if two_tailed else z_upper(alpha)
+    z_beta = _z_power(power)
     p_bar = (p1 + p2) / 2
     q_bar = 1 - p_bar
     num = (z_alpha * np.sqrt(2 * p_bar * q_bar) + z_beta * np.sqrt(p1*(1-p1) + p2*(1-p2))) ** 2
     den = (p2 - p1) ** 2
-    return int(np.ceil(num / den))
+    return _ceil_sizes(num, den, mde)
 
-def sample_size_means(sd: float, params: PowerParams) -> int:
-    alpha = params.alpha
-    beta = 1 - params.power
-    z_alpha = norm.ppf(1 - alpha/2) if params.two_tailed else norm.ppf(1 - alpha)
-    z_beta = norm.ppf(1 - beta)
+def sample_size_means_grid(sd, mde, alpha: float = 0.05, power=0.8,
+                           two_tailed: bool = True) -> np.ndarray:
+    # Per-group sample sizes over broadcast sd x mde x power grids
+    sd, mde, power = np.broadcast_arrays(
+        np.asarray(sd, dtype=float), np.asarray(mde, dtype=float), np.asarray(power, dtype=float))
+    z_alpha = z_upper(alpha/2) if two_tailed else z_upper(alpha)
+    z_beta = _z_power(power)
     num = 2 * (sd ** 2) * (z_alpha + z_beta) ** 2
-    den = params.mde ** 2
-    return int(np.ceil(num / den))
\ No newline at end of file
+    den = mde ** 2
+    return _ceil_sizes(num, den, mde)
+
+def sample_size_proportions(params: PowerParams) -> int:
+    return int(sample_size_proportions_grid(params.baseline, params.mde, params.alpha,
+                                            params.power, params.two_tailed))
+
+def sample_size_means(sd: float, params: PowerParams) -> int:
+    return int(sample_size_means_grid(sd, params.mde, params.alpha, params.power, params.two_tailed))
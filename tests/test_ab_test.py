@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from src.ab_test import ab_means, ab_proportions
+
+
+def test_ab_means_cuped_keeps_nominal_size_under_null():
+    # Covariate with a large level (mean 100) used to inflate false positives
+    # when each group got its own c around an uncentered theta.
+    rng = np.random.default_rng(0)
+    runs = 400
+    rejections = 0
+    for _ in range(runs):
+        theta_a = rng.normal(100, 10, 500)
+        theta_b = rng.normal(100, 10, 600)
+        y_a = theta_a + rng.normal(size=500)
+        y_b = theta_b + rng.normal(size=600)
+        res = ab_means(y_a, y_b, cuped_theta_a=theta_a, cuped_theta_b=theta_b)
+        rejections += res.p_value < 0.05
+    assert rejections / runs < 0.10
+
+
+def test_ab_means_cuped_detects_shift_with_smaller_se():
+    rng = np.random.default_rng(1)
+    theta_a = rng.normal(100, 10, 500)
+    theta_b = rng.normal(100, 10, 600)
+    y_a = theta_a + rng.normal(size=500)
+    y_b = theta_b + 0.3 + rng.normal(size=600)
+    plain = ab_means(y_a, y_b)
+    adj = ab_means(y_a, y_b, cuped_theta_a=theta_a, cuped_theta_b=theta_b)
+    assert adj.ci_high - adj.ci_low < plain.ci_high - plain.ci_low
+    assert adj.ci_low < 0.3 < adj.ci_high
+    assert adj.p_value < 0.05
+
+
+def test_ab_means_constant_groups():
+    # Zero variance in both arms: distinct means are certain, equal means undefined
+    assert ab_means([1, 1, 1], [2, 2, 2]).p_value == 0.0
+    assert np.isnan(ab_means([1, 1, 1], [1, 1, 1]).p_value)
+
+
+def test_ab_means_cuped_collinear_covariate_is_not_significant():
+    # theta explains y exactly: what remains of the lift is rounding noise
+    rng = np.random.default_rng(2)
+    theta = rng.normal(5, 1, 200)
+    res = ab_means(3 * theta[:100] + 1, 3 * theta[100:] + 1,
+                   cuped_theta_a=theta[:100], cuped_theta_b=theta[100:])
+    assert abs(res.lift) < 1e-9
+    assert np.isnan(res.p_value)
+
+
+def test_ab_proportions_rejects_nan_counts():
+    with pytest.raises(ValueError):
+        ab_proportions(np.nan, 100, 10, 100)
+    with pytest.raises(ValueError):
+        ab_proportions([10, 20], [100, np.nan], [15, 30], [100, 100])